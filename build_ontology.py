@@ -0,0 +1,313 @@
+# build_ontology.py
+#
+# Build an ontology for a BODMAS-focused Intelligent Tutoring System
+# using Owlready2. This script defines the core classes, properties,
+# some example individuals, and an example SWRL rule. Run it directly
+# to regenerate bodmas_tutor.owl.
+
+import warnings
+
+from owlready2 import driver, get_ontology, Thing, ObjectProperty, DataProperty
+
+# Owlready2's Cython parser is much faster at loading ontologies than its
+# pure-Python fallback, but it is only built when Cython is available at install time.
+# The driver finds it either top-level or inside the owlready2 package; ask it
+# rather than guessing where it was installed
+if driver.owlready2_optimized is None:
+    warnings.warn(
+        "owlready2_optimized is not available; ontology loading will use the slower "
+        "pure-Python parser. Reinstall owlready2 with Cython installed to build it."
+    )
+
+ONTOLOGY_FILE = "bodmas_tutor.owl"
+
+
+def build():
+    """Create the BODMAS tutor ontology and return it."""
+    # Create / load ontology
+    onto = get_ontology(r"C:\Users\opeye\OneDrive\Documents\Assessment\Second Semester\AIC\BODMAS\bodmas_tutor.owx")
+
+    with onto:
+        # =========================
+        # Core classes
+        # =========================
+        class Expression(Thing):
+            """Any arithmetic expression."""
+            pass
+
+        class SimpleExpression(Expression):
+            """Expression with a single operation."""
+            pass
+
+        class CompoundExpression(Expression):
+            """Expression with multiple operations / nested parts."""
+            pass
+
+        class Operation(Thing):
+            """An arithmetic operation occurring in an expression."""
+            pass
+
+        class BracketOperation(Operation):
+            pass
+
+        class OrderOperation(Operation):
+            """Powers / roots etc."""
+            pass
+
+        class DivisionOperation(Operation):
+            pass
+
+        class MultiplicationOperation(Operation):
+            pass
+
+        class AdditionOperation(Operation):
+            pass
+
+        class SubtractionOperation(Operation):
+            pass
+
+        class BODMASStage(Thing):
+            """Brackets, Orders, Division/Multiplication, Addition/Subtraction."""
+            pass
+
+        class Skill(Thing):
+            """A sub-skill, e.g. 'Apply brackets first'."""
+            pass
+
+        class ErrorPattern(Thing):
+            """A recurring type of error / misconception."""
+            pass
+
+        class IgnoredBracketsError(ErrorPattern):
+            """Student ignored brackets that should be evaluated first."""
+            pass
+
+        class IgnoredPrecedenceError(ErrorPattern):
+            """Student chose a lower-precedence operation while a higher one was available."""
+            pass
+
+        class FeedbackAction(Thing):
+            """A tutoring action triggered by an error pattern."""
+            pass
+
+        class Student(Thing):
+            """Learner using the tutor."""
+            pass
+
+        class Attempt(Thing):
+            """A single step in solving an expression."""
+            pass
+
+        # =========================
+        # Object properties
+        # =========================
+        class hasOperation(ObjectProperty):
+            domain = [Expression]
+            range = [Operation]
+
+        class hasSubExpression(ObjectProperty):
+            domain = [CompoundExpression]
+            range = [Expression]
+
+        class hasStage(ObjectProperty):
+            domain = [Operation]
+            range = [BODMASStage]
+
+        class targetsStage(ObjectProperty):
+            domain = [Skill]
+            range = [BODMASStage]
+
+        class attemptOf(ObjectProperty):
+            domain = [Attempt]
+            range = [Expression]
+
+        class performedBy(ObjectProperty):
+            domain = [Attempt]
+            range = [Student]
+
+        class appliedOperation(ObjectProperty):
+            domain = [Attempt]
+            range = [Operation]
+
+        class violatesError(ObjectProperty):
+            domain = [Attempt]
+            range = [ErrorPattern]
+
+        class suggestsFeedback(ObjectProperty):
+            domain = [ErrorPattern]
+            range = [FeedbackAction]
+
+        class hasNextProblem(ObjectProperty):
+            """Optional link from a student to the next recommended expression."""
+            domain = [Student]
+            range = [Expression]
+
+        # =========================
+        # Data properties
+        # =========================
+        class hasDifficultyLevel(DataProperty):
+            domain = [Expression]
+            range = [int]
+
+        class hasPrecedenceLevel(DataProperty):
+            """Numeric precedence: Brackets=4, Orders=3, Div/Mul=2, Add/Sub=1."""
+            domain = [BODMASStage]
+            range = [int]
+
+        class hasMastery(DataProperty):
+            """Mastery score for a skill (0–1)."""
+            domain = [Skill]
+            range = [float]
+
+        class isCorrectStep(DataProperty):
+            domain = [Attempt]
+            range = [bool]
+
+        class timeTakenSeconds(DataProperty):
+            domain = [Attempt]
+            range = [int]
+
+        class naturalLanguageText(DataProperty):
+            """Human-readable text for a feedback action."""
+            domain = [FeedbackAction]
+            range = [str]
+
+        # =========================
+        # Stage individuals (BODMAS)
+        # =========================
+        # Property values are passed to the constructors so each individual is
+        # written in one go, rather than created and then appended to
+        stage_brackets = BODMASStage("StageBrackets", hasPrecedenceLevel=[4])
+        stage_orders = BODMASStage("StageOrders", hasPrecedenceLevel=[3])
+        stage_div_mul = BODMASStage("StageDivMul", hasPrecedenceLevel=[2])
+        stage_add_sub = BODMASStage("StageAddSub", hasPrecedenceLevel=[1])
+
+        # =========================
+        # Feedback actions
+        # =========================
+        fb_concept_hint = FeedbackAction("GiveConceptHint", naturalLanguageText=[
+            "Remember BODMAS: solve brackets and orders before multiplication, "
+            "division, addition and subtraction."
+        ])
+
+        fb_worked_example = FeedbackAction("ShowWorkedExample", naturalLanguageText=[
+            "Let us walk through a similar expression step by step."
+        ])
+
+        fb_simpler_problem = FeedbackAction("SuggestSimplerProblem", naturalLanguageText=[
+            "Let's try a simpler expression with the same idea, then come back to this one."
+        ])
+
+        # =========================
+        # Error patterns
+        # =========================
+        ignored_brackets = IgnoredBracketsError(
+            "IgnoredBrackets",
+            suggestsFeedback=[fb_concept_hint],
+        )
+
+        ignored_precedence = IgnoredPrecedenceError(
+            "IgnoredPrecedence",
+            suggestsFeedback=[fb_concept_hint],
+        )
+
+        # You can map specific errors to different feedback if desired
+        # e.g. ignored_precedence.suggestsFeedback.append(fb_worked_example)
+
+        # =========================
+        # Skills
+        # =========================
+        skill_brackets_first = Skill(
+            "SkillApplyBracketsFirst",
+            targetsStage=[stage_brackets],
+            hasMastery=[0.0],
+        )
+
+        skill_orders = Skill(
+            "SkillApplyOrders",
+            targetsStage=[stage_orders],
+            hasMastery=[0.0],
+        )
+
+        skill_div_mul = Skill(
+            "SkillDivMulBeforeAddSub",
+            targetsStage=[stage_div_mul],
+            hasMastery=[0.0],
+        )
+
+        skill_add_sub = Skill(
+            "SkillAddSubAtEnd",
+            targetsStage=[stage_add_sub],
+            hasMastery=[0.0],
+        )
+
+        # =========================
+        # Example expression, operations, student and attempt
+        # =========================
+        # Expression: 7 + 3 × 4  (without brackets)
+        op_add = AdditionOperation("Plus_Expr1", hasStage=[stage_add_sub])
+        op_mul = MultiplicationOperation("Times_Expr1", hasStage=[stage_div_mul])
+
+        expr1 = CompoundExpression(
+            "Expr_7_plus_3_times_4",
+            hasDifficultyLevel=[1],
+            hasOperation=[op_add, op_mul],
+        )
+
+        # Example student
+        s1 = Student("Student_Ali")
+
+        # Attempt: student incorrectly chooses to do addition first
+        attempt1 = Attempt(
+            "Attempt1",
+            performedBy=[s1],
+            attemptOf=[expr1],
+            appliedOperation=[op_add],
+            isCorrectStep=[False],
+            timeTakenSeconds=[15],
+            # For now we can manually attach an error pattern
+            violatesError=[ignored_precedence],
+        )
+
+        # =========================
+        # Example SWRL rule
+        # =========================
+        #
+        # Idea:
+        # If an Attempt uses an operation whose BODMAS stage has a LOWER
+        # precedenceLevel than another operation still in the same Expression,
+        # then classify that Attempt as an IgnoredPrecedenceError.
+        #
+        # Note: SWRL rule with built-ins (swrlb:lessThan) is commented out
+        # because owlready2 has limited SWRL support. You can implement this
+        # logic in Python or use a full reasoner (Pellet, Hermit) externally.
+
+        # rule_ignored_precedence = Imp()
+        # rule_ignored_precedence.set_as_rule("""
+        #     Attempt(?a),
+        #     appliedOperation(?a, ?opLow),
+        #     hasStage(?opLow, ?stageLow),
+        #     hasPrecedenceLevel(?stageLow, ?pLow),
+        #     attemptOf(?a, ?expr),
+        #     hasOperation(?expr, ?opHigh),
+        #     hasStage(?opHigh, ?stageHigh),
+        #     hasPrecedenceLevel(?stageHigh, ?pHigh),
+        #     swrlb:lessThan(?pLow, ?pHigh)
+        #     ->
+        #     IgnoredPrecedenceError(?a)
+        # """)
+
+    return onto
+
+
+# =========================
+# Save ontology
+# =========================
+def save(onto, path=ONTOLOGY_FILE):
+    print("Classes in ontology:", list(onto.classes()))
+    onto.save(file=path, format="rdfxml")
+    print("Ontology saved as " + path)
+
+
+if __name__ == "__main__":
+    save(build())
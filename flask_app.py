@@ -1,20 +1,139 @@
 """
 Flask API for BODMAS Master Tutoring System
 Provides REST endpoints and serves a BODMAS-focused intelligent tutoring interface
+Has no __main__ block: the server is started through BODMAS.py
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request, stream_with_context
+from flask.json.provider import JSONProvider
+import hashlib
+import math
 import re
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Generator, Iterator, List, Optional, Sequence, Tuple, Union
+
+import orjson
+import ormsgpack
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson; keys keep their insertion order"""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs) -> Response:
+        # Hand orjson's bytes straight to the response, skipping a str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
 
 # Initialize Flask app
 app = Flask(__name__)
-app.config['JSON_SORT_KEYS'] = False
+app.json = OrjsonProvider(app)
 
 # ========================
 # BODMAS Solver & Validation
 # ========================
 
+# One token per match: a number (2, 2.5, 2., .5, 1e3, 2.5E-4) or an operator/bracket.
+# ASCII only, so \d and \s do not accept other scripts' digits or spaces
+_TOKEN_RE = re.compile(r'\s*(?:((?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|(\*\*|[+\-*/()]))', re.ASCII)
+
+# Unary minus binds tighter than * and / but looser than **, as in Python (-2 ** 2 == -4)
+_NEG_LEVEL = 2.5
+
+# (kind, value): numbers are parsed once, whole numbers to int so they stay
+# exact as in Python; everything else keeps its symbol
+Token = Tuple[str, Union[int, float, str]]
+
+# Integer powers above this many bits are computed as floats instead, so a
+# huge power overflows quickly rather than building an enormous integer
+_MAX_POWER_BITS = 1024
+
+# Expressions up to this many characters are kept in the token cache
+_MAX_CACHED_LENGTH = 200
+
+_STAGE_NAMES = {
+    '**': 'Orders/Exponents',
+    '*': 'Division/Multiplication',
+    '/': 'Division/Multiplication',
+    '+': 'Addition/Subtraction',
+    '-': 'Addition/Subtraction',
+}
+
+def _scan(expr: str) -> Tuple[Token, ...]:
+    """Split an expression into (kind, value) tokens in a single scan"""
+    tokens = []
+    pos, end = 0, len(expr.rstrip())
+    while pos < end:
+        match = _TOKEN_RE.match(expr, pos)
+        if match is None:
+            raise ValueError(f'Unexpected character at position {pos}')
+        number, symbol = match.groups()
+        pos = match.end()
+        
+        if number:
+            tokens.append(('num', int(number) if number.isdigit() else float(number)))
+        elif symbol == '(':
+            tokens.append(('lparen', symbol))
+        elif symbol == ')':
+            tokens.append(('rparen', symbol))
+        elif symbol in ('+', '-') and (not tokens or tokens[-1][0] in ('op', 'neg', 'lparen')):
+            # A sign where a number is expected; unary plus changes nothing
+            if symbol == '-':
+                tokens.append(('neg', symbol))
+        else:
+            tokens.append(('op', symbol))
+    return tuple(tokens)
+
+_scan_cached = lru_cache(maxsize=1024)(_scan)
+
+def _tokenize(expr: str) -> Tuple[Token, ...]:
+    """Tokens for an expression; short ones are cached, so repeat solves skip scanning
+    
+    Longer expressions are scanned each time, so the cache never keeps large
+    request strings and their tokens alive between requests.
+    """
+    if len(expr) <= _MAX_CACHED_LENGTH:
+        return _scan_cached(expr)
+    return _scan(expr)
+
+def _power(a: Union[int, float], b: Union[int, float]) -> Union[int, float]:
+    if isinstance(a, int) and isinstance(b, int) and b > 0 and b * a.bit_length() > _MAX_POWER_BITS:
+        return float(a) ** b
+    return a ** b
+
+def _format_number(value: Union[int, float], base: bool = False) -> str:
+    """Show whole numbers without a trailing .0, e.g. 12 rather than 12.0
+    
+    Very large values use float notation (1.0715086071862673e+301) rather than
+    printing every digit; exact integers keep their digits up to 1e21. A
+    negative base of a power is bracketed, since -2 ** 2 would read as -(2 ** 2).
+    """
+    if isinstance(value, int):
+        text = f'{value}' if abs(value) < 10 ** 21 else repr(float(value))
+    else:
+        text = f'{int(value)}' if value.is_integer() and abs(value) < 1e15 else repr(value)
+    return f'({text})' if base and value < 0 else text
+
+def _render(tokens: Sequence[Token]) -> str:
+    """Turn tokens back into a readable expression, e.g. (2 + 3) * -4"""
+    text = ''
+    prev = None
+    for i, (kind, value) in enumerate(tokens):
+        if prev is not None and kind != 'rparen' and prev not in ('lparen', 'neg'):
+            text += ' '
+        if kind == 'num':
+            is_base = i + 1 < len(tokens) and tokens[i + 1] == ('op', '**')
+            text += _format_number(value, base=is_base)
+        else:
+            text += value
+        prev = kind
+    return text
+
 class BODMASSolver:
     """Solves arithmetic expressions following BODMAS rules"""
     
@@ -24,23 +143,20 @@ class BODMASSolver:
             '-': (1, lambda a, b: a - b),
             '*': (2, lambda a, b: a * b),
             '/': (2, lambda a, b: a / b if b != 0 else float('inf')),
-            '**': (3, lambda a, b: a ** b),
+            '**': (3, _power),
         }
     
-    def solve(self, expr: str) -> float:
+    def solve(self, expr: str) -> Optional[float]:
         """Solve expression following BODMAS - the ONLY correct way"""
-        try:
-            # Use Python's built-in eval which follows BODMAS rules
-            result = eval(expr)
-            return float(result)
-        except Exception as e:
-            return None
+        return self.solve_with_steps(expr)[0]
     
     def validate_answer(self, expr: str, student_answer: float) -> Dict:
         """Strictly validate answer against BODMAS rules"""
+        return self.validate_against(student_answer, self.solve(expr))
+    
+    def validate_against(self, student_answer: float, correct_answer: Optional[float]) -> Dict:
+        """Validate answer against an already computed correct answer"""
         try:
-            correct_answer = self.solve(expr)
-            
             if correct_answer is None:
                 return {
                     'is_correct': False,
@@ -63,174 +179,301 @@ class BODMASSolver:
                 'correct_answer': None
             }
     
-    def get_correct_steps(self, expr: str) -> List[Dict]:
-        """Get step-by-step solution following BODMAS"""
-        steps = [{'step': 0, 'expression': expr, 'description': 'Original expression'}]
+    def solve_with_steps(self, expr: str) -> Tuple[Optional[float], List[Dict]]:
+        """Solve expression following BODMAS and explain it step by step, in one pass
+        
+        The answer is the value the steps reduce to, or None when the
+        expression cannot be fully solved.
+        """
+        steps = []
+        walk = self.iter_steps(expr)
+        while True:
+            try:
+                steps.append(next(walk))
+            except StopIteration as done:
+                return done.value, steps
+    
+    def iter_steps(self, expr: str) -> Generator[Dict, None, Optional[float]]:
+        """Yield each solution step as soon as it is worked out; returns the final value"""
+        yield {'step': 0, 'expression': expr, 'description': 'Original expression'}
         
         try:
-            # Remove spaces
-            expr_clean = expr.replace(' ', '')
-            
-            # Handle brackets
-            step_num = 1
-            current_expr = expr_clean
+            stack = []
+            reductions = self._walk(_tokenize(expr), stack)
+            for number, (expression, description) in enumerate(reductions, start=1):
+                yield {
+                    'step': number,
+                    'expression': expression,
+                    'description': description
+                }
             
-            while '(' in current_expr:
-                match = re.search(r'\([^()]+\)', current_expr)
-                if match:
-                    bracket_expr = match.group(0)[1:-1]
-                    try:
-                        bracket_result = eval(bracket_expr)
-                        new_expr = current_expr[:match.start()] + str(bracket_result) + current_expr[match.end():]
-                        steps.append({
-                            'step': step_num,
-                            'expression': new_expr,
-                            'description': f'Brackets: ({bracket_expr}) = {bracket_result}'
-                        })
-                        current_expr = new_expr
-                        step_num += 1
-                    except:
-                        break
-                else:
-                    break
+            if len(stack) != 1 or stack[0][0] != 'num':
+                return None
+            answer = float(stack[0][1])
+            return answer if math.isfinite(answer) else None
+        except Exception as e:
+            return None
+    
+    def _walk(self, tokens: Sequence[Token], stack: List[Token]) -> Iterator[Tuple[str, str]]:
+        """Reduce tokens in a single left-to-right pass
+        
+        The stack holds the part of the expression read so far, reduced as far
+        as BODMAS allows. Yields (expression, description) for each operation.
+        Numbers and operators must alternate, so an operator is only ever
+        applied to two numbers.
+        """
+        expect_number = True
+        for i, token in enumerate(tokens):
+            kind, value = token
+            if expect_number != (kind in ('num', 'neg', 'lparen')):
+                raise ValueError(f'Unexpected {value!r} in expression')
+            expect_number = kind in ('op', 'neg', 'lparen')
             
-            # Handle exponents
-            while '**' in current_expr:
-                match = re.search(r'(\d+\.?\d*)\*\*(\d+\.?\d*)', current_expr)
-                if match:
-                    try:
-                        result = float(match.group(1)) ** float(match.group(2))
-                        new_expr = current_expr[:match.start()] + str(result) + current_expr[match.end():]
-                        steps.append({
-                            'step': step_num,
-                            'expression': new_expr,
-                            'description': f'Orders/Exponents: {match.group(0)} = {result}'
-                        })
-                        current_expr = new_expr
-                        step_num += 1
-                    except:
-                        break
-                else:
+            if kind == 'op':
+                level = self.operations[value][0]
+                yield from self._reduce(stack, tokens[i:], level, right_assoc=(value == '**'))
+                stack.append(token)
+            elif kind == 'rparen':
+                yield from self._reduce(stack, tokens[i:], closing=True)
+            else:
+                stack.append(token)
+        
+        if expect_number:
+            raise ValueError('Expression is incomplete')
+        yield from self._reduce(stack, ())
+    
+    def _reduce(self, stack: List[Token], remaining: Sequence[Token], level: float = 0,
+                right_assoc: bool = False, closing: bool = False) -> Iterator[Tuple[str, str]]:
+        """Apply operators on top of the stack that bind at least as tightly as `level`"""
+        while len(stack) >= 2:
+            kind, op = stack[-2]
+            if kind == 'neg':
+                if _NEG_LEVEL < level:
                     break
+                stack[-2:] = [('num', -stack[-1][1])]
+                continue
+            if kind != 'op':
+                break
             
-            # Handle multiplication and division (left to right)
-            while '*' in current_expr or '/' in current_expr:
-                match = re.search(r'(-?\d+\.?\d*)\s*([\*/])\s*(-?\d+\.?\d*)', current_expr)
-                if match:
-                    try:
-                        op = match.group(2)
-                        a, b = float(match.group(1)), float(match.group(3))
-                        result = a * b if op == '*' else a / b if b != 0 else float('inf')
-                        new_expr = current_expr[:match.start()] + str(result) + current_expr[match.end():]
-                        steps.append({
-                            'step': step_num,
-                            'expression': new_expr,
-                            'description': f'Division/Multiplication: {match.group(0)} = {result}'
-                        })
-                        current_expr = new_expr
-                        step_num += 1
-                    except:
-                        break
-                else:
-                    break
+            op_level, apply = self.operations[op]
+            if op_level < level or (op_level == level and right_assoc):
+                break
             
-            # Handle addition and subtraction (left to right)
-            while '+' in current_expr[1:] or '-' in current_expr[1:]:  # Skip leading sign
-                match = re.search(r'(-?\d+\.?\d*)\s*([\+\-])\s*(-?\d+\.?\d*)', current_expr[1:])
-                if match:
-                    try:
-                        offset = 1
-                        op = match.group(2)
-                        a, b = float(match.group(1)), float(match.group(3))
-                        result = a + b if op == '+' else a - b
-                        new_expr = current_expr[:match.start() + offset] + str(result) + current_expr[match.end() + offset:]
-                        steps.append({
-                            'step': step_num,
-                            'expression': new_expr,
-                            'description': f'Addition/Subtraction: {match.group(0)} = {result}'
-                        })
-                        current_expr = new_expr
-                        step_num += 1
-                    except:
-                        break
-                else:
-                    break
+            a, b = stack[-3][1], stack[-1][1]
+            result = apply(a, b)
+            stack[-3:] = [('num', result)]
             
-            return steps
-        except Exception as e:
-            return steps
+            # The last operation inside a bracket resolves the bracket itself
+            if closing and len(stack) >= 2 and stack[-2][0] == 'lparen':
+                del stack[-2]
+                yield self._describe_step([*stack, *remaining[1:]], op, a, b, result, bracket=True)
+                return
+            yield self._describe_step([*stack, *remaining], op, a, b, result)
+        
+        if closing:
+            # A bracket around a single number, e.g. (5), needs no step of its own
+            if len(stack) < 2 or stack[-2][0] != 'lparen':
+                raise ValueError('Unbalanced brackets')
+            del stack[-2]
+    
+    def _describe_step(self, tokens: List[Token], op: str, a: float, b: float,
+                       result: float, bracket: bool = False) -> Tuple[str, str]:
+        """Render the expression after one applied operation, and explain the operation"""
+        operation = f'{_format_number(a, base=(op == "**"))} {op} {_format_number(b)}'
+        if bracket:
+            description = f'Brackets: ({operation}) = {_format_number(result)}'
+        else:
+            description = f'{_STAGE_NAMES[op]}: {operation} = {_format_number(result)}'
+        return _render(tokens), description
 
 solver = BODMASSolver()
 
 # ========================
-# Helper Functions
+# Sample Questions
+# ========================
+
+# Sample BODMAS questions from the ontology; fixed, so built and serialised once
+_SAMPLE_QUESTIONS = (
+    {
+        'id': 1,
+        'question': '2 + 3 * 4',
+        'difficulty': 'Easy',
+        'concept': 'Multiplication before Addition',
+        'correct_answer': 14
+    },
+    {
+        'id': 2,
+        'question': '(2 + 3) * 4',
+        'difficulty': 'Easy',
+        'concept': 'Brackets first',
+        'correct_answer': 20
+    },
+    {
+        'id': 3,
+        'question': '10 - 2 * 3',
+        'difficulty': 'Medium',
+        'concept': 'Multiplication before Subtraction',
+        'correct_answer': 4
+    },
+    {
+        'id': 4,
+        'question': '20 / 4 + 3',
+        'difficulty': 'Medium',
+        'concept': 'Division before Addition',
+        'correct_answer': 8
+    },
+    {
+        'id': 5,
+        'question': '2 ** 3 + 4',
+        'difficulty': 'Medium',
+        'concept': 'Orders/Exponents first',
+        'correct_answer': 12
+    },
+    {
+        'id': 6,
+        'question': '(10 - 4) * 2 + 3',
+        'difficulty': 'Hard',
+        'concept': 'Complex expression',
+        'correct_answer': 15
+    },
+    {
+        'id': 7,
+        'question': '24 / 3 / 2',
+        'difficulty': 'Hard',
+        'concept': 'Division left to right',
+        'correct_answer': 4
+    },
+    {
+        'id': 8,
+        'question': '2 * 3 + 4 * 5',
+        'difficulty': 'Hard',
+        'concept': 'Multiple operations',
+        'correct_answer': 26
+    },
+)
+
+_SAMPLE_QUESTIONS_JSON = orjson.dumps({
+    'success': True,
+    'questions': _SAMPLE_QUESTIONS
+})
+
+# Correct answer and worked steps for each sample question, keyed by its
+# tokens, so checking a sample answer needs no solving however it is spaced
+_PRECOMPUTED = {
+    _tokenize(q['question']): solver.solve_with_steps(q['question'])
+    for q in _SAMPLE_QUESTIONS
+}
+
+def precomputed_solution(expr: str) -> Optional[Tuple[Optional[float], List[Dict]]]:
+    """Answer and steps for a sample question, with step 0 showing expr as submitted"""
+    try:
+        solution = _PRECOMPUTED.get(_tokenize(expr))
+    except ValueError:
+        return None
+    if solution is None:
+        return None
+    answer, steps = solution
+    return answer, [{'step': 0, 'expression': expr, 'description': 'Original expression'}, *steps[1:]]
+
+def solve_response(expr: str, answer: Optional[float], steps: List[Dict]) -> Dict:
+    """Build the /api/solve response body"""
+    return {
+        'success': True,
+        'expression': expr,
+        'answer': answer,
+        'steps': steps
+    }
+
+def stream_steps(expr: str) -> Iterator[bytes]:
+    """Stream the /api/solve response as ndjson: one line per step, then the answer"""
+    walk = solver.iter_steps(expr)
+    while True:
+        try:
+            step = next(walk)
+        except StopIteration as done:
+            yield orjson.dumps({'success': True, 'expression': expr, 'answer': done.value}) + b'\n'
+            return
+        yield orjson.dumps(step) + b'\n'
+
+# Complete /api/solve response bodies for the sample questions as the
+# interface sends them, so solving one is a lookup with no serialisation
+_SOLVED_RESPONSES = {
+    q['question']: orjson.dumps(solve_response(q['question'], *_PRECOMPUTED[_tokenize(q['question'])]))
+    for q in _SAMPLE_QUESTIONS
+}
+
+# ========================
+# Learning Material
 # ========================
 
-def get_sample_questions() -> List[Dict]:
-    """Get sample BODMAS questions from ontology"""
-    return [
-        {
-            'id': 1,
-            'question': '2 + 3 * 4',
-            'difficulty': 'Easy',
-            'concept': 'Multiplication before Addition',
-            'correct_answer': 14
-        },
-        {
-            'id': 2,
-            'question': '(2 + 3) * 4',
-            'difficulty': 'Easy',
-            'concept': 'Brackets first',
-            'correct_answer': 20
-        },
-        {
-            'id': 3,
-            'question': '10 - 2 * 3',
-            'difficulty': 'Medium',
-            'concept': 'Multiplication before Subtraction',
-            'correct_answer': 4
-        },
-        {
-            'id': 4,
-            'question': '20 / 4 + 3',
-            'difficulty': 'Medium',
-            'concept': 'Division before Addition',
-            'correct_answer': 8
-        },
-        {
-            'id': 5,
-            'question': '2 ** 3 + 4',
-            'difficulty': 'Medium',
-            'concept': 'Orders/Exponents first',
-            'correct_answer': 12
-        },
-        {
-            'id': 6,
-            'question': '(10 - 4) * 2 + 3',
-            'difficulty': 'Hard',
-            'concept': 'Complex expression',
-            'correct_answer': 15
-        },
-        {
-            'id': 7,
-            'question': '24 / 3 / 2',
-            'difficulty': 'Hard',
-            'concept': 'Division left to right',
-            'correct_answer': 4
-        },
-        {
-            'id': 8,
-            'question': '2 * 3 + 4 * 5',
-            'difficulty': 'Hard',
-            'concept': 'Multiple operations',
-            'correct_answer': 26
-        },
-    ]
+# BODMAS concepts are static: each response body and its ETag are built once
+_CONCEPTS = {
+    'brackets': {
+        'title': 'Understanding Brackets',
+        'description': 'Brackets show which calculation to do first',
+        'rule': 'Always solve what is inside brackets before doing anything else',
+        'example': '(2 + 3) × 4 = 5 × 4 = 20, NOT 2 + (3 × 4) = 2 + 12 = 14',
+        'common_mistakes': ['Ignoring brackets', 'Solving outside brackets first']
+    },
+    'orders': {
+        'title': 'Understanding Orders (Exponents)',
+        'description': 'Orders means powers, roots, and other similar operations',
+        'rule': 'Solve exponents and powers before multiplication/division',
+        'example': '2 × 3² = 2 × 9 = 18, NOT (2 × 3)² = 6² = 36',
+        'common_mistakes': ['Treating exponents as multiplication', 'Wrong order of operations']
+    },
+    'division_multiplication': {
+        'title': 'Division and Multiplication',
+        'description': 'These operations have equal priority and are done left to right',
+        'rule': 'Do multiplication and division from left to right, before addition/subtraction',
+        'example': '12 ÷ 2 × 3 = 6 × 3 = 18, NOT 12 ÷ (2 × 3) = 12 ÷ 6 = 2',
+        'common_mistakes': ['Wrong order', 'Not going left to right']
+    },
+    'addition_subtraction': {
+        'title': 'Addition and Subtraction',
+        'description': 'These are done last and from left to right',
+        'rule': 'Do addition and subtraction from left to right, after all other operations',
+        'example': '10 - 2 + 3 = 8 + 3 = 11, NOT 10 - (2 + 3) = 10 - 5 = 5',
+        'common_mistakes': ['Wrong order', 'Not going left to right']
+    }
+}
+
+def _cacheable(payload: Dict) -> Tuple[bytes, str]:
+    """Serialise a static response once and derive its ETag from the body"""
+    body = orjson.dumps(payload)
+    return body, hashlib.md5(body).hexdigest()
+
+_CONCEPT_RESPONSES = {
+    name: _cacheable({'success': True, 'concept': concept})
+    for name, concept in _CONCEPTS.items()
+}
 
 # ========================
 # API Routes
 # ========================
 
+MAX_BATCH_SIZE = 100
+
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+def read_payload():
+    """Decode the request body: msgpack when the client sends it, JSON otherwise"""
+    if request.mimetype == MSGPACK_MIMETYPE:
+        return ormsgpack.unpackb(request.get_data(cache=False))
+    return request.get_json()
+
+def accepts_msgpack() -> bool:
+    return request.accept_mimetypes.best_match(['application/json', MSGPACK_MIMETYPE]) == MSGPACK_MIMETYPE
+
+def reply(payload: Dict, status: int = 200):
+    """Encode a response as msgpack if the client prefers it, JSON otherwise"""
+    if accepts_msgpack():
+        return Response(ormsgpack.packb(payload), status=status, mimetype=MSGPACK_MIMETYPE)
+    return jsonify(payload), status
+
+# Shared by batch requests so threads are not spawned per request
+_check_pool = ThreadPoolExecutor(max_workers=4)
+
 @app.route('/')
 def index():
     """Serve the BODMAS tutoring interface"""
@@ -239,142 +482,160 @@ def index():
 @app.route('/api/questions')
 def api_questions():
     """API endpoint: Get sample BODMAS questions"""
-    try:
-        questions = get_sample_questions()
-        return jsonify({
-            'success': True,
-            'questions': questions
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    return Response(_SAMPLE_QUESTIONS_JSON, mimetype='application/json')
 
 @app.route('/api/solve', methods=['POST'])
 def api_solve():
     """API endpoint: Solve a BODMAS expression"""
     try:
-        data = request.get_json()
+        data = read_payload()
         expr = data.get('expression', '')
         
         if not expr:
-            return jsonify({
+            return reply({
                 'success': False,
                 'error': 'Expression is required'
-            }), 400
+            }, 400)
         
-        steps = solver.get_correct_steps(expr)
-        answer = solver.solve(expr)
+        # Clients that ask for ndjson get each step as soon as it is worked out
+        accepted = request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson'])
+        if accepted == 'application/x-ndjson':
+            return Response(stream_with_context(stream_steps(expr)), mimetype='application/x-ndjson')
         
-        return jsonify({
-            'success': True,
-            'expression': expr,
-            'answer': answer,
-            'steps': steps
-        })
+        if expr in _SOLVED_RESPONSES and not accepts_msgpack():
+            return Response(_SOLVED_RESPONSES[expr], mimetype='application/json')
+        
+        answer, steps = solver.solve_with_steps(expr)
+        
+        return reply(solve_response(expr, answer, steps))
     except Exception as e:
-        return jsonify({
+        return reply({
             'success': False,
             'error': f'Invalid expression: {str(e)}'
-        }), 400
+        }, 400)
+
+def check_answer(data: Dict) -> Tuple[Dict, int]:
+    """Check one student's answer; returns the response body and its HTTP status"""
+    if not isinstance(data, dict):
+        return {
+            'success': False,
+            'error': 'Expression and answer are required'
+        }, 400
+    
+    expr = data.get('expression', '')
+    student_answer = data.get('answer')
+    
+    if not expr or student_answer is None:
+        return {
+            'success': False,
+            'error': 'Expression and answer are required'
+        }, 400
+    
+    if not isinstance(expr, str):
+        return {
+            'success': False,
+            'error': 'Invalid expression'
+        }, 400
+    
+    # Convert to float
+    try:
+        student_answer = float(student_answer)
+    except:
+        return {
+            'success': False,
+            'error': 'Invalid answer format. Please enter a number.'
+        }, 400
+    
+    # The correct answer and the steps come from the same pass over the expression
+    correct_answer, steps = precomputed_solution(expr) or solver.solve_with_steps(expr)
+    
+    # Validate answer strictly against BODMAS rules
+    validation = solver.validate_against(student_answer, correct_answer)
+    
+    if 'error' in validation:
+        return {
+            'success': False,
+            'error': validation['error']
+        }, 400
+    
+    return {
+        'success': True,
+        'expression': expr,
+        'student_answer': validation['student_answer'],
+        'correct_answer': validation['correct_answer'],
+        'is_correct': validation['is_correct'],
+        'steps': steps,
+        'feedback': generate_feedback(validation)
+    }, 200
 
 @app.route('/api/check-answer', methods=['POST'])
 def api_check_answer():
     """API endpoint: Check student's answer and provide feedback"""
     try:
-        data = request.get_json()
-        expr = data.get('expression', '')
-        student_answer = data.get('answer')
-        
-        if not expr or student_answer is None:
-            return jsonify({
-                'success': False,
-                'error': 'Expression and answer are required'
-            }), 400
+        response, status = check_answer(read_payload())
+        return reply(response, status)
+    except Exception as e:
+        return reply({
+            'success': False,
+            'error': str(e)
+        }, 500)
+
+def check_batch_item(data: Dict) -> Dict:
+    """Check one answer of a batch; a failure becomes that answer's result, not the batch's"""
+    try:
+        return check_answer(data)[0]
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+@app.route('/api/check-answers', methods=['POST'])
+def api_check_answers():
+    """API endpoint: Check a batch of answers, e.g. a whole practice session, in one request"""
+    try:
+        data = read_payload()
+        items = data.get('answers') if isinstance(data, dict) else None
         
-        # Convert to float
-        try:
-            student_answer = float(student_answer)
-        except:
-            return jsonify({
+        if not isinstance(items, list) or not items:
+            return reply({
                 'success': False,
-                'error': 'Invalid answer format. Please enter a number.'
-            }), 400
+                'error': 'A list of answers is required'
+            }, 400)
         
-        # Validate answer strictly against BODMAS rules
-        validation = solver.validate_answer(expr, student_answer)
-        
-        if 'error' in validation:
-            return jsonify({
+        if len(items) > MAX_BATCH_SIZE:
+            return reply({
                 'success': False,
-                'error': validation['error']
-            }), 400
+                'error': f'At most {MAX_BATCH_SIZE} answers can be checked at once'
+            }, 400)
         
-        # Get correct steps
-        steps = solver.get_correct_steps(expr)
+        # Results keep the order of the submitted answers
+        results = list(_check_pool.map(check_batch_item, items))
         
-        response = {
+        return reply({
             'success': True,
-            'expression': expr,
-            'student_answer': validation['student_answer'],
-            'correct_answer': validation['correct_answer'],
-            'is_correct': validation['is_correct'],
-            'steps': steps,
-            'feedback': generate_feedback(validation)
-        }
-        
-        return jsonify(response)
+            'results': results
+        })
     except Exception as e:
-        return jsonify({
+        return reply({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/learn/<concept>')
 def api_learn_concept(concept):
     """API endpoint: Get learning material for a BODMAS concept"""
-    concepts = {
-        'brackets': {
-            'title': 'Understanding Brackets',
-            'description': 'Brackets show which calculation to do first',
-            'rule': 'Always solve what is inside brackets before doing anything else',
-            'example': '(2 + 3) × 4 = 5 × 4 = 20, NOT 2 + (3 × 4) = 2 + 12 = 14',
-            'common_mistakes': ['Ignoring brackets', 'Solving outside brackets first']
-        },
-        'orders': {
-            'title': 'Understanding Orders (Exponents)',
-            'description': 'Orders means powers, roots, and other similar operations',
-            'rule': 'Solve exponents and powers before multiplication/division',
-            'example': '2 × 3² = 2 × 9 = 18, NOT (2 × 3)² = 6² = 36',
-            'common_mistakes': ['Treating exponents as multiplication', 'Wrong order of operations']
-        },
-        'division_multiplication': {
-            'title': 'Division and Multiplication',
-            'description': 'These operations have equal priority and are done left to right',
-            'rule': 'Do multiplication and division from left to right, before addition/subtraction',
-            'example': '12 ÷ 2 × 3 = 6 × 3 = 18, NOT 12 ÷ (2 × 3) = 12 ÷ 6 = 2',
-            'common_mistakes': ['Wrong order', 'Not going left to right']
-        },
-        'addition_subtraction': {
-            'title': 'Addition and Subtraction',
-            'description': 'These are done last and from left to right',
-            'rule': 'Do addition and subtraction from left to right, after all other operations',
-            'example': '10 - 2 + 3 = 8 + 3 = 11, NOT 10 - (2 + 3) = 10 - 5 = 5',
-            'common_mistakes': ['Wrong order', 'Not going left to right']
-        }
-    }
-    
-    if concept not in concepts:
+    if concept not in _CONCEPT_RESPONSES:
         return jsonify({
             'success': False,
             'error': f'Unknown concept: {concept}'
         }), 404
     
-    return jsonify({
-        'success': True,
-        'concept': concepts[concept]
-    })
+    body, etag = _CONCEPT_RESPONSES[concept]
+    headers = {'ETag': f'"{etag}"', 'Cache-Control': 'public, max-age=3600'}
+    if request.if_none_match.contains_weak(etag):
+        return Response(status=304, headers=headers)
+    return Response(body, mimetype='application/json', headers=headers)
 
 def generate_feedback(validation: Dict) -> str:
     """Generate personalized feedback based on validation"""
@@ -400,8 +661,3 @@ def internal_error(error):
         'success': False,
         'error': 'Internal server error'
     }), 500
-
-if __name__ == '__main__':
-    print("Starting BODMAS Master Tutoring System...")
-    print("Web interface available at: http://localhost:5000")
-    app.run(debug=True, host='0.0.0.0', port=5000)
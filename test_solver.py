@@ -0,0 +1,377 @@
+"""
+Tests for the BODMAS step-by-step solver
+"""
+
+import hashlib
+
+import orjson
+import ormsgpack
+import pytest
+
+import flask_app
+from flask_app import _SAMPLE_QUESTIONS, _scan_cached, app, solver
+
+
+def descriptions(expr):
+    return [step['description'] for step in solver.solve_with_steps(expr)[1][1:]]
+
+
+def expressions(expr):
+    return [step['expression'] for step in solver.solve_with_steps(expr)[1]]
+
+
+# ========================
+# Sample questions
+# ========================
+
+SAMPLE_STEPS = {
+    '2 + 3 * 4': [
+        'Division/Multiplication: 3 * 4 = 12',
+        'Addition/Subtraction: 2 + 12 = 14',
+    ],
+    '(2 + 3) * 4': [
+        'Brackets: (2 + 3) = 5',
+        'Division/Multiplication: 5 * 4 = 20',
+    ],
+    '10 - 2 * 3': [
+        'Division/Multiplication: 2 * 3 = 6',
+        'Addition/Subtraction: 10 - 6 = 4',
+    ],
+    '20 / 4 + 3': [
+        'Division/Multiplication: 20 / 4 = 5',
+        'Addition/Subtraction: 5 + 3 = 8',
+    ],
+    '2 ** 3 + 4': [
+        'Orders/Exponents: 2 ** 3 = 8',
+        'Addition/Subtraction: 8 + 4 = 12',
+    ],
+    '(10 - 4) * 2 + 3': [
+        'Brackets: (10 - 4) = 6',
+        'Division/Multiplication: 6 * 2 = 12',
+        'Addition/Subtraction: 12 + 3 = 15',
+    ],
+    '24 / 3 / 2': [
+        'Division/Multiplication: 24 / 3 = 8',
+        'Division/Multiplication: 8 / 2 = 4',
+    ],
+    '2 * 3 + 4 * 5': [
+        'Division/Multiplication: 2 * 3 = 6',
+        'Division/Multiplication: 4 * 5 = 20',
+        'Addition/Subtraction: 6 + 20 = 26',
+    ],
+}
+
+
+@pytest.mark.parametrize('question', _SAMPLE_QUESTIONS, ids=lambda q: q['question'])
+def test_sample_question_answer(question):
+    answer, steps = solver.solve_with_steps(question['question'])
+    assert answer == question['correct_answer']
+    assert steps[0] == {'step': 0, 'expression': question['question'], 'description': 'Original expression'}
+    assert [step['step'] for step in steps] == list(range(len(steps)))
+
+
+@pytest.mark.parametrize('expr', SAMPLE_STEPS)
+def test_sample_question_steps(expr):
+    assert descriptions(expr) == SAMPLE_STEPS[expr]
+
+
+def test_step_expressions_show_remaining_work():
+    assert expressions('(10 - 4) * 2 + 3') == ['(10 - 4) * 2 + 3', '6 * 2 + 3', '12 + 3', '15']
+
+
+# ========================
+# Precedence and signs
+# ========================
+
+def test_unary_minus_binds_looser_than_power():
+    answer, steps = solver.solve_with_steps('-2 ** 2')
+    assert answer == -4
+    assert steps[-1]['expression'] == '-4'
+    assert descriptions('-2 ** 2') == ['Orders/Exponents: 2 ** 2 = 4']
+
+
+def test_negative_base_is_bracketed():
+    assert descriptions('(-2) ** 2') == ['Orders/Exponents: (-2) ** 2 = 4']
+
+
+def test_power_is_right_associative():
+    assert solver.solve_with_steps('2 ** 3 ** 2')[0] == 512
+    assert descriptions('2 ** 3 ** 2') == [
+        'Orders/Exponents: 3 ** 2 = 9',
+        'Orders/Exponents: 2 ** 9 = 512',
+    ]
+
+
+def test_subtracting_a_negative_number():
+    assert solver.solve_with_steps('3 - -2')[0] == 5
+    assert descriptions('3 - -2') == ['Addition/Subtraction: 3 - -2 = 5']
+
+
+def test_nested_brackets():
+    assert solver.solve_with_steps('((2+3)*(4-1))')[0] == 15
+    assert expressions('((2+3)*(4-1))') == ['((2+3)*(4-1))', '(5 * (4 - 1))', '(5 * 3)', '15']
+    assert descriptions('((2+3)*(4-1))') == [
+        'Brackets: (2 + 3) = 5',
+        'Brackets: (4 - 1) = 3',
+        'Brackets: (5 * 3) = 15',
+    ]
+
+
+def test_decimals():
+    assert solver.solve_with_steps('.5 + 1')[0] == 1.5
+    assert solver.solve_with_steps('2. * 1.25')[0] == 2.5
+    assert descriptions('.5 + 1') == ['Addition/Subtraction: 0.5 + 1 = 1.5']
+
+
+def test_scientific_notation():
+    assert solver.solve_with_steps('1e3')[0] == 1000
+    assert solver.solve_with_steps('2.5E-1 * 4')[0] == 1
+    assert solver.solve_with_steps('1e+2 + .5e1')[0] == 105
+
+
+def test_whole_numbers_stay_exact():
+    answer, steps = solver.solve_with_steps('99999999999999999 - 99999999999999998')
+    assert answer == 1
+    assert steps[-1]['description'] == 'Addition/Subtraction: 99999999999999999 - 99999999999999998 = 1'
+    assert solver.solve_with_steps('7 / 2')[0] == 3.5
+
+
+def test_huge_power_is_invalid():
+    assert solver.solve_with_steps('9 ** 9 ** 9')[0] is None
+
+
+def test_large_results_use_float_notation():
+    answer, steps = solver.solve_with_steps('2 ** 1000')
+    assert answer == 2.0 ** 1000
+    assert steps[-1]['expression'] == '1.0715086071862673e+301'
+    assert descriptions('2 ** 1000') == ['Orders/Exponents: 2 ** 1000 = 1.0715086071862673e+301']
+    assert expressions('10 ** 14 * 9') == ['10 ** 14 * 9', '100000000000000 * 9', '900000000000000']
+
+
+def test_long_expressions_are_not_cached():
+    expr = ' + '.join(['1'] * 200)
+    cached = _scan_cached.cache_info().currsize
+    assert solver.solve_with_steps(expr)[0] == 200
+    assert _scan_cached.cache_info().currsize == cached
+
+
+def test_bracket_around_a_single_number_needs_no_step():
+    assert solver.solve_with_steps('(5) * 2')[0] == 10
+    assert descriptions('(5) * 2') == ['Division/Multiplication: 5 * 2 = 10']
+
+
+# ========================
+# Invalid expressions
+# ========================
+
+@pytest.mark.parametrize('expr', ['(2 + 3', '2 + 3)', ')(', '((1)'])
+def test_unbalanced_brackets_are_invalid(expr):
+    assert solver.solve_with_steps(expr)[0] is None
+
+
+def test_division_by_zero_is_invalid():
+    answer, steps = solver.solve_with_steps('1/0')
+    assert answer is None
+    assert steps[-1]['description'] == 'Division/Multiplication: 1 / 0 = inf'
+
+
+@pytest.mark.parametrize('expr', [
+    '__import__("os")',
+    '2 $ 3',
+    'x + 1',
+    '2 +',
+    '* 3',
+    '2 * * 3',
+    '(*300000000',
+    '2 * * 100000000',
+    '()',
+    '2 -',
+    '1 0 - 2 * 3',
+    '2 (3)',
+    '. + 1',
+    '1.2.3',
+    '1e',
+    '2 e 3',
+    '\u0661 + 1',
+    '2\u00a0+ 1',
+    '',
+    '   ',
+])
+def test_rejected_inputs(expr):
+    answer, steps = solver.solve_with_steps(expr)
+    assert answer is None
+    assert steps[0]['expression'] == expr
+
+
+def test_solve_matches_the_worked_steps():
+    assert solver.solve('2 ** 3 + 4') == 12
+    assert solver.solve('__import__("os")') is None
+
+
+def test_validate_answer_reports_invalid_expression():
+    assert solver.validate_answer('2 +', 2)['error'] == 'Invalid expression'
+    assert solver.validate_answer('2 + 3 * 4', 14)['is_correct'] is True
+    assert solver.validate_answer('2 + 3 * 4', 20)['is_correct'] is False
+
+
+# ========================
+# Answer checking API
+# ========================
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def test_check_answer_shows_the_submitted_expression(client):
+    response = client.post('/api/check-answer', json={'expression': '2+3*4', 'answer': 14})
+    assert response.status_code == 200
+    assert response.json['is_correct'] is True
+    assert response.json['steps'][0]['expression'] == '2+3*4'
+    assert response.json['steps'][1]['description'] == 'Division/Multiplication: 3 * 4 = 12'
+
+
+def test_check_answer_does_not_match_samples_by_characters(client):
+    response = client.post('/api/check-answer', json={'expression': '1 0 - 2 * 3', 'answer': 4})
+    assert response.status_code == 400
+    assert response.json['error'] == 'Invalid expression'
+
+
+@pytest.mark.parametrize('expression', [5, [2, '+', 3], {'a': 1}])
+def test_check_answer_rejects_non_string_expressions(client, expression):
+    response = client.post('/api/check-answer', json={'expression': expression, 'answer': 5})
+    assert response.status_code == 400
+    assert response.json['error'] == 'Invalid expression'
+
+
+@pytest.mark.parametrize('body', ['null', '[]', '{"answers": []}', '{"answers": "2 + 2"}'])
+def test_check_answers_requires_a_list(client, body):
+    response = client.post('/api/check-answers', data=body, content_type='application/json')
+    assert response.status_code == 400
+    assert response.json['error'] == 'A list of answers is required'
+
+
+def test_check_answers_keeps_submission_order(client):
+    response = client.post('/api/check-answers', json={'answers': [
+        {'expression': '2 + 3 * 4', 'answer': 14},
+        {'expression': '(2 + 3) * 4', 'answer': 14},
+        {'expression': 5, 'answer': 5},
+        'not an answer',
+        {'expression': '10 - 2 * 3', 'answer': 4},
+    ]})
+    assert response.status_code == 200
+    results = response.json['results']
+    assert [result['success'] for result in results] == [True, True, False, False, True]
+    assert [result.get('is_correct') for result in results] == [True, False, None, None, True]
+    assert [result.get('expression') for result in results] == ['2 + 3 * 4', '(2 + 3) * 4', None, None, '10 - 2 * 3']
+    assert results[2]['error'] == 'Invalid expression'
+
+
+def test_check_answers_reports_a_failing_item_on_its_own(client, monkeypatch):
+    check_answer = flask_app.check_answer
+
+    def failing_check(data):
+        if data['expression'] == 'boom':
+            raise RuntimeError('checker failed')
+        return check_answer(data)
+
+    monkeypatch.setattr(flask_app, 'check_answer', failing_check)
+    response = client.post('/api/check-answers', json={'answers': [
+        {'expression': 'boom', 'answer': 1},
+        {'expression': '2+2', 'answer': 4},
+    ]})
+    assert response.status_code == 200
+    assert response.json['results'][0] == {'success': False, 'error': 'checker failed'}
+    assert response.json['results'][1]['is_correct'] is True
+
+
+# ========================
+# Streaming, msgpack and caching
+# ========================
+
+def ndjson_lines(response):
+    return [orjson.loads(line) for line in response.data.splitlines()]
+
+
+def test_solve_streams_one_line_per_step(client):
+    response = client.post('/api/solve', json={'expression': '(2 + 3) * 4'},
+                           headers={'Accept': 'application/x-ndjson'})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = ndjson_lines(response)
+    assert lines[:-1] == solver.solve_with_steps('(2 + 3) * 4')[1]
+    assert lines[-1] == {'success': True, 'expression': '(2 + 3) * 4', 'answer': 20}
+
+
+def test_solve_stream_ends_with_no_answer_for_invalid_expression(client):
+    response = client.post('/api/solve', json={'expression': '2 * * 3'},
+                           headers={'Accept': 'application/x-ndjson'})
+    assert response.status_code == 200
+    assert ndjson_lines(response) == [
+        {'step': 0, 'expression': '2 * * 3', 'description': 'Original expression'},
+        {'success': True, 'expression': '2 * * 3', 'answer': None},
+    ]
+
+
+def test_check_answer_round_trips_msgpack(client):
+    response = client.post('/api/check-answer',
+                           data=ormsgpack.packb({'expression': '2 + 3 * 4', 'answer': 14}),
+                           content_type='application/msgpack',
+                           headers={'Accept': 'application/msgpack'})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/msgpack'
+    body = ormsgpack.unpackb(response.data)
+    assert body['is_correct'] is True
+    assert body['steps'] == solver.solve_with_steps('2 + 3 * 4')[1]
+
+
+def test_msgpack_errors_keep_their_status(client):
+    response = client.post('/api/check-answer',
+                           data=ormsgpack.packb({'expression': '2 +', 'answer': 2}),
+                           content_type='application/msgpack',
+                           headers={'Accept': 'application/msgpack'})
+    assert response.status_code == 400
+    assert ormsgpack.unpackb(response.data) == {'success': False, 'error': 'Invalid expression'}
+
+
+def test_sample_solve_in_msgpack_skips_the_prebuilt_json(client):
+    response = client.post('/api/solve', json={'expression': '2 + 3 * 4'},
+                           headers={'Accept': 'application/msgpack'})
+    assert response.mimetype == 'application/msgpack'
+    body = ormsgpack.unpackb(response.data)
+    assert body['answer'] == 14
+    assert body['steps'] == solver.solve_with_steps('2 + 3 * 4')[1]
+
+    response = client.post('/api/solve', json={'expression': '2 + 3 * 4'})
+    assert response.mimetype == 'application/json'
+    assert response.json == body
+
+
+def test_learn_sends_etag_and_cache_control(client):
+    response = client.get('/api/learn/brackets')
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'public, max-age=3600'
+    assert response.headers['ETag'] == f'"{hashlib.md5(response.data).hexdigest()}"'
+    assert response.json['concept']['title'] == 'Understanding Brackets'
+
+
+@pytest.mark.parametrize('if_none_match', ['"{etag}"', 'W/"{etag}"', '"other", "{etag}"', '*'])
+def test_learn_answers_matching_etag_with_304(client, if_none_match):
+    etag = client.get('/api/learn/brackets').headers['ETag'].strip('"')
+    response = client.get('/api/learn/brackets', headers={'If-None-Match': if_none_match.format(etag=etag)})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == f'"{etag}"'
+
+
+def test_learn_sends_the_body_when_etag_differs(client):
+    response = client.get('/api/learn/brackets', headers={'If-None-Match': '"stale"'})
+    assert response.status_code == 200
+    assert response.json['success'] is True
+
+
+def test_learn_unknown_concept(client):
+    response = client.get('/api/learn/fractions')
+    assert response.status_code == 404
+    assert response.json == {'success': False, 'error': 'Unknown concept: fractions'}
+    assert 'ETag' not in response.headers